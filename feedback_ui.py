@@ -5,74 +5,86 @@
 import os
 import sys
 import json
+import weakref
 import argparse
 from typing import Optional, TypedDict, List
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QCheckBox, QTextEdit, QPlainTextEdit, QGroupBox,
-    QFrame
+    QFrame, QSizePolicy
 )
 from PySide6.QtCore import Qt, Signal, QObject, QTimer, QSettings
 from PySide6.QtGui import QTextCursor, QIcon, QKeyEvent, QPalette, QColor, QFont
 
+# Maximum number of distinct lines whose measured width is remembered
+_LINE_WIDTH_CACHE_SIZE = 4096
+
+# Single QApplication shared by every feedback_ui() call in this process
+_app: Optional[QApplication] = None
+
 class FeedbackResult(TypedDict):
     interactive_feedback: str
     git_commit: bool
 
+# Output directories already known to exist
+_DIR_CACHE: set[str] = set()
+
+# Dark mode colors, built once and shared by every palette
+_C_WINDOW = QColor(53, 53, 53)
+_C_BASE = QColor(42, 42, 42)
+_C_ALTERNATE_BASE = QColor(66, 66, 66)
+_C_DARK = QColor(35, 35, 35)
+_C_SHADOW = QColor(20, 20, 20)
+_C_DISABLED_TEXT = QColor(127, 127, 127)
+_C_HIGHLIGHT = QColor(42, 130, 218)
+_C_DISABLED_HIGHLIGHT = QColor(80, 80, 80)
+
+# The dark palette and Fusion style are applied to the shared QApplication once
+_STYLE_APPLIED = False
+
 def get_dark_mode_palette(app: QApplication):
     darkPalette = app.palette()
-    darkPalette.setColor(QPalette.Window, QColor(53, 53, 53))
+    darkPalette.setColor(QPalette.Window, _C_WINDOW)
     darkPalette.setColor(QPalette.WindowText, Qt.white)
-    darkPalette.setColor(QPalette.Disabled, QPalette.WindowText, QColor(127, 127, 127))
-    darkPalette.setColor(QPalette.Base, QColor(42, 42, 42))
-    darkPalette.setColor(QPalette.AlternateBase, QColor(66, 66, 66))
-    darkPalette.setColor(QPalette.ToolTipBase, QColor(53, 53, 53))
+    darkPalette.setColor(QPalette.Disabled, QPalette.WindowText, _C_DISABLED_TEXT)
+    darkPalette.setColor(QPalette.Base, _C_BASE)
+    darkPalette.setColor(QPalette.AlternateBase, _C_ALTERNATE_BASE)
+    darkPalette.setColor(QPalette.ToolTipBase, _C_WINDOW)
     darkPalette.setColor(QPalette.ToolTipText, Qt.white)
     darkPalette.setColor(QPalette.Text, Qt.white)
-    darkPalette.setColor(QPalette.Disabled, QPalette.Text, QColor(127, 127, 127))
-    darkPalette.setColor(QPalette.Dark, QColor(35, 35, 35))
-    darkPalette.setColor(QPalette.Shadow, QColor(20, 20, 20))
-    darkPalette.setColor(QPalette.Button, QColor(53, 53, 53))
+    darkPalette.setColor(QPalette.Disabled, QPalette.Text, _C_DISABLED_TEXT)
+    darkPalette.setColor(QPalette.Dark, _C_DARK)
+    darkPalette.setColor(QPalette.Shadow, _C_SHADOW)
+    darkPalette.setColor(QPalette.Button, _C_WINDOW)
     darkPalette.setColor(QPalette.ButtonText, Qt.white)
-    darkPalette.setColor(QPalette.Disabled, QPalette.ButtonText, QColor(127, 127, 127))
+    darkPalette.setColor(QPalette.Disabled, QPalette.ButtonText, _C_DISABLED_TEXT)
     darkPalette.setColor(QPalette.BrightText, Qt.red)
-    darkPalette.setColor(QPalette.Link, QColor(42, 130, 218))
-    darkPalette.setColor(QPalette.Highlight, QColor(42, 130, 218))
-    darkPalette.setColor(QPalette.Disabled, QPalette.Highlight, QColor(80, 80, 80))
+    darkPalette.setColor(QPalette.Link, _C_HIGHLIGHT)
+    darkPalette.setColor(QPalette.Highlight, _C_HIGHLIGHT)
+    darkPalette.setColor(QPalette.Disabled, QPalette.Highlight, _C_DISABLED_HIGHLIGHT)
     darkPalette.setColor(QPalette.HighlightedText, Qt.white)
-    darkPalette.setColor(QPalette.Disabled, QPalette.HighlightedText, QColor(127, 127, 127))
-    darkPalette.setColor(QPalette.PlaceholderText, QColor(127, 127, 127))
+    darkPalette.setColor(QPalette.Disabled, QPalette.HighlightedText, _C_DISABLED_TEXT)
+    darkPalette.setColor(QPalette.PlaceholderText, _C_DISABLED_TEXT)
     return darkPalette
 
 class FeedbackTextEdit(QPlainTextEdit):
-    def __init__(self, parent=None):
+    def __init__(self, feedback_ui: "FeedbackUI", parent=None):
         super().__init__(parent)
-        # Connect text change signal to update window size
-        self.textChanged.connect(self._on_text_changed)
+        # Weak so the text edit doesn't keep its window alive through a cycle
+        self._ui = weakref.proxy(feedback_ui)
+        # Track edits per block so only the changed lines are re-measured
+        self.document().contentsChange.connect(self._on_contents_change)
 
     def keyPressEvent(self, event: QKeyEvent):
         if event.key() == Qt.Key_Return and event.modifiers() == Qt.ControlModifier:
-            # Find the parent FeedbackUI instance and call submit
-            parent = self.parent()
-            while parent and not isinstance(parent, FeedbackUI):
-                parent = parent.parent()
-            if parent:
-                parent._submit_feedback()
+            self._ui._submit_feedback()
         else:
             super().keyPressEvent(event)
     
-    def _on_text_changed(self):
-        # Only resize if content actually changed (not just focus events)
-        current_text = self.toPlainText()
-        if not hasattr(self, '_last_text') or self._last_text != current_text:
-            self._last_text = current_text
-            # Find the parent FeedbackUI instance and trigger resize
-            parent = self.parent()
-            while parent and not isinstance(parent, FeedbackUI):
-                parent = parent.parent()
-            if parent:
-                parent._adjust_window_size()
+    def _on_contents_change(self, position: int, chars_removed: int, chars_added: int):
+        self._ui._update_block_widths(position, chars_removed, chars_added)
+        self._ui._adjust_window_size()
 
 class FeedbackUI(QMainWindow):
     def __init__(self, prompt: str, predefined_options: Optional[List[str]] = None, font_size: int = 12):
@@ -82,6 +94,19 @@ class FeedbackUI(QMainWindow):
         self.font_size = font_size
 
         self.feedback_result = None
+
+        # Measured line widths keyed by line text, so unchanged lines aren't re-shaped
+        self._line_width_cache: dict[str, int] = {}
+
+        # Coalesce bursts of keystrokes into a single resize pass
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(50)
+        self._resize_timer.timeout.connect(self._adjust_window_size_impl)
+        # Resizing is pointless until the window is shown; showEvent sizes it once
+        self._ready = False
+        # Last (width, height, text height) applied by the resize pass
+        self._last_applied: Optional[tuple[int, int, int]] = None
         
         self.setWindowTitle("Interactive Feedback MCP")
         script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -153,14 +178,18 @@ class FeedbackUI(QMainWindow):
             feedback_layout.addWidget(separator)
 
         # Free-form text feedback
-        self.feedback_text = FeedbackTextEdit()
+        self.feedback_text = FeedbackTextEdit(self)
         self.feedback_text.setFont(font)
+        self._rebuild_block_widths()
         font_metrics = self.feedback_text.fontMetrics()
         row_height = font_metrics.height()
         # Calculate initial height for 3 lines + some padding for margins
         padding = self.feedback_text.contentsMargins().top() + self.feedback_text.contentsMargins().bottom() + 8 # Reduced padding
         self.initial_text_height = 3 * row_height + padding
+        self._current_text_height = self.initial_text_height
         self.feedback_text.setMinimumHeight(self.initial_text_height)
+        # Let the layout hand any spare height to the text area
+        self.feedback_text.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         
         # Store font metrics for dynamic resizing
         self.row_height = row_height
@@ -177,30 +206,33 @@ class FeedbackUI(QMainWindow):
         submit_button.setFont(font)
         submit_button.clicked.connect(self._submit_feedback)
 
-        feedback_layout.addWidget(self.feedback_text)
+        feedback_layout.addWidget(self.feedback_text, 1)
         feedback_layout.addWidget(self.git_commit_checkbox)
         feedback_layout.addWidget(submit_button)
 
         # Note: minimum height will be dynamically adjusted
 
         # Add widgets
-        layout.addWidget(self.feedback_group)
-        
-        # Initialize the window size correctly
-        self._adjust_window_size()
+        layout.addWidget(self.feedback_group, 1)
 
     def _adjust_window_size(self):
+        """Schedule a window resize, restarting the timer on every call"""
+        if not self._ready:
+            return
+        self._resize_timer.start()
+
+    def _adjust_window_size_impl(self):
         """Dynamically adjust window size based on text content"""
-        text_content = self.feedback_text.toPlainText()
-        lines = text_content.split('\n')
-        line_count = len(lines)
+        document = self.feedback_text.document()
+        line_count = document.blockCount()
         
-        # Calculate the width needed for the longest line
-        font_metrics = self.feedback_text.fontMetrics()
-        max_line_width = 0
-        for line in lines:
-            line_width = font_metrics.horizontalAdvance(line)
-            max_line_width = max(max_line_width, line_width)
+        # Window width limits (minimum 600, maximum 900)
+        min_width = 600
+        max_width = 900
+        width_padding = 100  # Padding for margins and scrollbar
+        
+        # Width needed for the longest line, kept up to date per edited block
+        max_line_width = self._max_block_width
         
         # Calculate new text area height (minimum 3 lines, maximum 15 lines)
         min_lines = 3
@@ -208,37 +240,101 @@ class FeedbackUI(QMainWindow):
         actual_lines = max(min_lines, min(line_count + 1, max_lines))  # +1 for cursor line
         new_text_height = actual_lines * self.row_height + self.text_padding
         
-        # Calculate new window width (minimum 600, maximum 900)
-        min_width = 600
-        max_width = 900
-        content_width = max_line_width + 100  # Add padding for margins and scrollbar
+        # Calculate new window width
+        content_width = max_line_width + width_padding
         new_width = max(min_width, min(content_width, max_width))
         
-        # Get current window size
-        current_size = self.size()
-        current_height = current_size.height()
+        # Calculate height difference from the cached sizes, avoiding geometry queries
+        height_diff = new_text_height - self._current_text_height
+        new_height = max(150, self._current_window_height + height_diff)  # Minimum height of 150
         
-        # Calculate height difference
-        current_text_height = self.feedback_text.height()
-        height_diff = new_text_height - current_text_height
-        new_height = max(150, current_height + height_diff)  # Minimum height of 150
+        # Typing within a line usually changes nothing; skip the relayout then
+        applied = (new_width, new_height, new_text_height)
+        if applied == self._last_applied:
+            return
+        self._last_applied = applied
         
-        # Update text area height
+        # Update text area height; the expanding size policy fills the rest
         self.feedback_text.setMinimumHeight(new_text_height)
-        self.feedback_text.setMaximumHeight(new_text_height)
+        self._current_text_height = new_text_height
+        if height_diff < 0:
+            # Apply the smaller minimum height now, otherwise the window
+            # can't shrink past the previous minimum size
+            self.feedback_group.layout().activate()
+            self.centralWidget().layout().activate()
+            self.layout().activate()
         
         # Resize window
         self.resize(new_width, new_height)
+        self._current_window_height = new_height
+
+    def _rebuild_block_widths(self):
+        """Measure every block of the document from scratch"""
+        document = self.feedback_text.document()
+        self._block_widths = []
+        block = document.begin()
+        while block.isValid():
+            self._block_widths.append(self._line_width(block.text()))
+            block = block.next()
+        self._recompute_max_block_width()
+
+    def _recompute_max_block_width(self):
+        """Find the widest block with a full pass over the known widths"""
+        self._max_block_width = max(self._block_widths)
+        self._max_block_number = self._block_widths.index(self._max_block_width)
+
+    def _update_block_widths(self, position: int, chars_removed: int, chars_added: int):
+        """Re-measure only the blocks touched by a document edit"""
+        document = self.feedback_text.document()
+        first = document.findBlock(position)
+        last = document.findBlock(position + chars_added)
+        if not last.isValid():
+            last = document.lastBlock()
+        first_number = first.blockNumber()
+        last_number = last.blockNumber()
+        # Edited range in the old block list, shifted by the blocks added or removed
+        old_last_number = last_number + len(self._block_widths) - document.blockCount()
+        if not first.isValid() or not first_number - 1 <= old_last_number < len(self._block_widths):
+            self._rebuild_block_widths()
+            return
+
+        widths = []
+        block = first
+        while block.isValid() and block.blockNumber() <= last_number:
+            widths.append(self._line_width(block.text()))
+            block = block.next()
+        self._block_widths[first_number:old_last_number + 1] = widths
+
+        # Keep the widest block up to date without rescanning in the common case
+        new_max = max(widths)
+        if first_number <= self._max_block_number <= old_last_number and new_max < self._max_block_width:
+            # The widest block was edited and shrank (or was removed)
+            self._recompute_max_block_width()
+            return
+        if self._max_block_number > old_last_number:
+            self._max_block_number += last_number - old_last_number
+        if new_max >= self._max_block_width:
+            self._max_block_width = new_max
+            self._max_block_number = first_number + widths.index(new_max)
+
+    def _line_width(self, line: str) -> int:
+        """Return the pixel width of a line, measuring it only if not cached"""
+        width = self._line_width_cache.get(line)
+        if width is None:
+            width = self.feedback_text.fontMetrics().horizontalAdvance(line)
+            if len(self._line_width_cache) >= _LINE_WIDTH_CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                del self._line_width_cache[next(iter(self._line_width_cache))]
+            self._line_width_cache[line] = width
+        return width
 
     def _submit_feedback(self):
         feedback_text = self.feedback_text.toPlainText().strip()
-        selected_options = []
-        
         # Get selected predefined options if any
-        if self.option_checkboxes:
-            for i, checkbox in enumerate(self.option_checkboxes):
-                if checkbox.isChecked():
-                    selected_options.append(self.predefined_options[i])
+        selected_options = [
+            option for checkbox, option in zip(self.option_checkboxes, self.predefined_options)
+            if checkbox.isChecked()
+        ]
         
         # Combine selected options and feedback text
         final_feedback_parts = []
@@ -260,6 +356,25 @@ class FeedbackUI(QMainWindow):
         )
         self.close()
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._ready = True
+        # Start from the laid-out size; later resizes keep these up to date
+        self._current_text_height = self.feedback_text.height()
+        self._current_window_height = self.height()
+        # Initialize the window size correctly
+        self._adjust_window_size_impl()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # Track manual resizes too, so the cached height stays accurate
+        size = event.size()
+        self._current_window_height = size.height()
+        # A size we didn't apply (e.g. a manual resize) must not short-circuit
+        # the next resize pass
+        if self._last_applied and (size.width(), size.height()) != self._last_applied[:2]:
+            self._last_applied = None
+
     def closeEvent(self, event):
         # Save general UI settings for the main window (geometry, state)
         self.settings.beginGroup("MainWindow_General")
@@ -279,18 +394,38 @@ class FeedbackUI(QMainWindow):
         return self.feedback_result
 
 def feedback_ui(prompt: str, predefined_options: Optional[List[str]] = None, output_file: Optional[str] = None, font_size: int = 12) -> Optional[FeedbackResult]:
-    app = QApplication.instance() or QApplication()
-    app.setPalette(get_dark_mode_palette(app))
-    app.setStyle("Fusion")
+    global _app, _STYLE_APPLIED
+    if _app is None:
+        _app = QApplication.instance()
+        if _app is None:
+            # Must be set before the QApplication is created
+            QApplication.setAttribute(Qt.AA_DontCreateNativeWidgetSiblings)
+            _app = QApplication(sys.argv)
+    app = _app
+    if not _STYLE_APPLIED:
+        app.setPalette(get_dark_mode_palette(app))
+        app.setStyle("Fusion")
+        _STYLE_APPLIED = True
     ui = FeedbackUI(prompt, predefined_options, font_size)
     result = ui.run()
 
     if output_file and result:
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(output_file) if os.path.dirname(output_file) else ".", exist_ok=True)
-        # Save the result to the output file
-        with open(output_file, "w") as f:
-            json.dump(result, f)
+        # Ensure the directory exists, checking each directory only once per process
+        output_dir = os.path.dirname(output_file) or "."
+        if output_dir not in _DIR_CACHE:
+            os.makedirs(output_dir, exist_ok=True)
+            _DIR_CACHE.add(output_dir)
+        # Save the result next to the output file, then rename it into place
+        # so readers never see a partially written file
+        tmp_file = output_file + ".tmp"
+        try:
+            with open(tmp_file, "wb") as f:
+                f.write(json.dumps(result).encode())
+            os.replace(tmp_file, output_file)
+        except Exception:
+            if os.path.exists(tmp_file):
+                os.unlink(tmp_file)
+            raise
         return None
 
     return result
@@ -299,13 +434,20 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run the feedback UI")
     parser.add_argument("--prompt", default="I implemented the changes you requested.", help="The prompt to show to the user")
     parser.add_argument("--predefined-options", default="", help="Pipe-separated list of predefined options (|||)")
-    parser.add_argument("--output-file", help="Path to save the feedback result as JSON")
+    parser.add_argument("--output-file", help="Path to save the feedback result as JSON (written to stdout if omitted)")
     parser.add_argument("--font-size", type=int, default=12, help="Font size for the UI (default: 12)")
+    parser.add_argument("--wait-for-start", action="store_true", help="Wait for a line on stdin before showing the UI (used to prewarm the process)")
     args = parser.parse_args()
 
-    predefined_options = [opt for opt in args.predefined_options.split("|||") if opt] if args.predefined_options else None
+    if args.wait_for_start and not sys.stdin.readline():
+        # stdin closed before the UI was requested: the caller went away
+        sys.exit(0)
+
+    predefined_options = args.predefined_options.split("|||") if args.predefined_options else None
+    predefined_options = [opt for opt in predefined_options if opt] if predefined_options else None
     
     result = feedback_ui(args.prompt, predefined_options, args.output_file, args.font_size)
     if result:
-        print(f"\nFeedback received:\n{result['interactive_feedback']}")
+        # No output file given: hand the result to the caller over stdout
+        sys.stdout.write(json.dumps(result))
     sys.exit(0)
@@ -5,11 +5,10 @@
 import os
 import sys
 import json
-import tempfile
 import subprocess
-import argparse
+import threading
 
-from typing import Annotated, Dict
+from typing import Annotated, Dict, Optional
 
 from fastmcp import FastMCP
 from pydantic import Field
@@ -20,49 +19,60 @@ mcp = FastMCP("Interactive Feedback MCP", log_level="ERROR")
 # Global variable to store font size from CLI args
 FONT_SIZE = 14  # Default font size
 
+# UI process that has already imported PySide6 and waits to be started
+_warm_ui: Optional[subprocess.Popen] = None
+_warm_ui_lock = threading.Lock()
+
+def spawn_feedback_ui() -> subprocess.Popen:
+    # Get the path to feedback_ui.py relative to this script
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    feedback_ui_path = os.path.join(script_dir, "feedback_ui.py")
+
+    # Run feedback_ui.py as a separate process; it imports everything up
+    # front, then waits for a line on stdin before showing the window
+    # NOTE: There appears to be a bug in uv, so we need
+    # to pass a bunch of special flags to make this work
+    args = [
+        sys.executable,
+        "-u",
+        feedback_ui_path,
+        "--prompt", "",
+        "--predefined-options", "",
+        "--font-size", str(FONT_SIZE),
+        "--wait-for-start"
+    ]
+    # Without --output-file the UI writes its JSON result to stdout
+    return subprocess.Popen(
+        args,
+        shell=False,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        stdin=subprocess.PIPE,
+        # Leaving close_fds off lets CPython use posix_spawn instead of
+        # fork+exec; Python fds are non-inheritable by default anyway
+        close_fds=False
+    )
+
+def prewarm_feedback_ui():
+    """Start the next UI process so its startup is off the request path"""
+    global _warm_ui
+    with _warm_ui_lock:
+        if _warm_ui is None:
+            _warm_ui = spawn_feedback_ui()
+
 def launch_feedback_ui() -> dict[str, str]:
-    # Create a temporary file for the feedback result
-    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
-        output_file = tmp.name
-
-    try:
-        # Get the path to feedback_ui.py relative to this script
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        feedback_ui_path = os.path.join(script_dir, "feedback_ui.py")
-
-        # Run feedback_ui.py as a separate process
-        # NOTE: There appears to be a bug in uv, so we need
-        # to pass a bunch of special flags to make this work
-        args = [
-            sys.executable,
-            "-u",
-            feedback_ui_path,
-            "--prompt", "",
-            "--output-file", output_file,
-            "--predefined-options", "",
-            "--font-size", str(FONT_SIZE)
-        ]
-        result = subprocess.run(
-            args,
-            check=False,
-            shell=False,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            stdin=subprocess.DEVNULL,
-            close_fds=True
-        )
-        if result.returncode != 0:
-            raise Exception(f"Failed to launch feedback UI: {result.returncode}")
-
-        # Read the result from the temporary file
-        with open(output_file, 'r') as f:
-            result = json.load(f)
-        os.unlink(output_file)
-        return result
-    except Exception as e:
-        if os.path.exists(output_file):
-            os.unlink(output_file)
-        raise e
+    global _warm_ui
+    with _warm_ui_lock:
+        process, _warm_ui = _warm_ui, None
+    if process is None or process.poll() is not None:
+        process = spawn_feedback_ui()
+
+    stdout, _ = process.communicate(b"\n")
+    if process.returncode != 0:
+        raise Exception(f"Failed to launch feedback UI: {process.returncode}")
+
+    prewarm_feedback_ui()
+    return json.loads(stdout)
 
 @mcp.tool()
 def interactive_feedback() -> Dict[str, str]:
@@ -81,13 +91,27 @@ def interactive_feedback() -> Dict[str, str]:
     
     return result
 
-if __name__ == "__main__":
+def parse_font_size(argv: list[str]) -> int:
+    # Fast path for the usual invocations, which avoids importing argparse
+    if not argv:
+        return FONT_SIZE
+    if len(argv) == 2 and argv[0] == "--font-size" and argv[1].isdigit():
+        return int(argv[1])
+
+    import argparse
+
     parser = argparse.ArgumentParser(description="Interactive Feedback MCP Server")
-    parser.add_argument("--font-size", type=int, default=14, 
-                       help="Font size for the feedback UI (default: 14)")
-    args = parser.parse_args()
-    
+    parser.add_argument("--font-size", type=int, default=FONT_SIZE, 
+                       help=f"Font size for the feedback UI (default: {FONT_SIZE})")
+    args = parser.parse_args(argv)
+    return args.font_size
+
+if __name__ == "__main__":
     # Update global font size from CLI args
-    FONT_SIZE = args.font_size
+    FONT_SIZE = parse_font_size(sys.argv[1:])
+
+    # Start a UI process now so the first feedback request doesn't pay
+    # for Python startup and the PySide6 import
+    prewarm_feedback_ui()
     
     mcp.run(transport="stdio")